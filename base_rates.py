@@ -0,0 +1,312 @@
+"""Base-rate cubes for "how rare is this chart" statistics.
+
+The cubes are built offline by sampling the 1800-2100 ephemeris over random
+times, latitudes and longitudes:
+
+    python base_rates.py --charts 2000000
+
+Counts are accumulated batch by batch into fixed-size histograms and written
+to ``base_rates.npz``. The chart page loads the file once per process and
+answers every rarity query for the current chart with table lookups.
+"""
+import argparse
+import math
+import os
+import time
+
+import numpy as np
+import swisseph as swe
+
+from chart_engine import (
+    PLANET_NAMES, SIGN_NAMES, NAKSHATRA_NAMES, NAKSHATRA_LORD, SIDEREAL_DEG_PER_DAY,
+    AYANAMSA_1900_DEG, PRECESSION_RATE_ARCSEC_PER_YEAR,
+    norm_deg, angles_from_armc, porphyry_cusps, evaluate_charts
+)
+
+BASE_RATES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "base_rates.npz")
+
+JD_START = swe.julday(1800, 1, 1, 0.0)
+JD_END = swe.julday(2101, 1, 1, 0.0)
+
+# Reference epoch of the linear ayanamsa model shared with the chart page
+JD_1900 = swe.julday(1900, 1, 1, 0.0)
+
+EPHEMERIS_PLANETS = [swe.SUN, swe.MOON, swe.MARS, swe.MERCURY, swe.JUPITER,
+                     swe.VENUS, swe.SATURN, swe.MEAN_NODE]
+
+# Per-planet categorical attributes used for the rarity score
+SCORE_CATEGORIES = ["house", "sign", "nakshatra", "navamsa", "aspect_mask", "control_mask"]
+SCORE_MAX = 400.0
+SCORE_BINS = 2000
+
+# Blocks of per-planet binary features: (name, values per planet), in cube order
+FEATURE_BLOCKS = [("house", 12), ("sign", 12), ("nakshatra", 27), ("nakshatra_lord", 9),
+                  ("navamsa", 12), ("aspects", 12), ("controls", 9)]
+
+# Nakshatra index -> index of its lord in PLANET_NAMES
+_NAKSHATRA_LORD_IDX = np.zeros(27, dtype=int)
+for _lord, _naks in NAKSHATRA_LORD.items():
+    _NAKSHATRA_LORD_IDX[_naks] = PLANET_NAMES.index(_lord)
+
+
+def feature_names():
+    """Labels of the binary per-chart features, in cube order"""
+    names = []
+    names += [f"{p} in H{h}" for p in PLANET_NAMES for h in range(1, 13)]
+    names += [f"{p} in {s}" for p in PLANET_NAMES for s in SIGN_NAMES]
+    names += [f"{p} in {n}" for p in PLANET_NAMES for n in NAKSHATRA_NAMES]
+    names += [f"{p} in a {q}-ruled nakshatra" for p in PLANET_NAMES for q in PLANET_NAMES]
+    names += [f"{p} in {s} navamsa" for p in PLANET_NAMES for s in SIGN_NAMES]
+    names += [f"{p} aspects H{h}" for p in PLANET_NAMES for h in range(1, 13)]
+    names += [f"{p} controls {q}" for p in PLANET_NAMES for q in PLANET_NAMES]
+    return names
+
+
+def chart_features(charts):
+    """Binary feature matrix (..., F) for charts in the array form of ``evaluate_charts``"""
+    def one_hot(idx, n):
+        return idx[..., None] == np.arange(n)
+
+    blocks = [
+        one_hot(charts['p_house'] - 1, 12),
+        one_hot(charts['p_sign_idx'], 12),
+        one_hot(charts['p_nak_idx'], 27),
+        one_hot(_NAKSHATRA_LORD_IDX[charts['p_nak_idx']], len(PLANET_NAMES)),
+        one_hot(charts['p_nav_idx'], 12),
+        charts['p_aspects'] > 0,
+        charts['p_controlling'],
+    ]
+    lead = charts['p_sign_idx'].shape[:-1]
+    return np.concatenate([b.reshape(lead + (-1,)) for b in blocks], axis=-1)
+
+
+def pattern_masks(charts):
+    """Per-planet aspect-house (12-bit) and controlled-planet (9-bit) masks"""
+    aspect_mask = ((charts['p_aspects'] > 0) * (1 << np.arange(12))).sum(axis=-1)
+    control_mask = (charts['p_controlling'] * (1 << np.arange(len(PLANET_NAMES)))).sum(axis=-1)
+    return aspect_mask, control_mask
+
+
+def _linear_ayanamsa(jd_ut):
+    return AYANAMSA_1900_DEG + (jd_ut - JD_1900) / 365.25 * PRECESSION_RATE_ARCSEC_PER_YEAR / 3600
+
+
+def _sample_charts(rng, n_charts, batch_size, charts_per_anchor, max_latitude):
+    """Yield batches of random charts in array form.
+
+    Exact positions and speeds are computed at random anchor times; each
+    anchor then seeds ``charts_per_anchor`` charts within +/- 6 hours using
+    linear extrapolation, with uniformly drawn latitude and longitude.
+    """
+    remaining = n_charts
+    while remaining > 0:
+        size = min(batch_size, remaining)
+        n_anchors = math.ceil(size / charts_per_anchor)
+        jd_anchor = rng.uniform(JD_START, JD_END, n_anchors)
+
+        lon_trop = np.empty((n_anchors, len(PLANET_NAMES)))
+        speed = np.empty((n_anchors, len(PLANET_NAMES)))
+        armc0 = np.empty(n_anchors)
+        obliquity = np.empty(n_anchors)
+        for a, jd in enumerate(jd_anchor):
+            for i, pid in enumerate(EPHEMERIS_PLANETS):
+                coords, _ = swe.calc_ut(jd, pid, swe.FLG_SWIEPH | swe.FLG_SPEED)
+                lon_trop[a, i] = coords[0]
+                speed[a, i] = coords[3]
+            armc0[a] = swe.sidtime(jd) * 15.0
+            obliquity[a] = swe.calc_ut(jd, swe.ECL_NUT)[0][0]
+        lon_trop[:, -1] = lon_trop[:, -2] + 180.0   # Ketu opposite Rahu
+        speed[:, -1] = speed[:, -2]
+
+        anchor = np.repeat(np.arange(n_anchors), charts_per_anchor)[:size]
+        dt_days = rng.uniform(-0.25, 0.25, size)
+        latitude = rng.uniform(-max_latitude, max_latitude, size)
+        longitude = rng.uniform(-180.0, 180.0, size)
+
+        armc = armc0[anchor] + dt_days * SIDEREAL_DEG_PER_DAY + longitude
+        asc, mc = angles_from_armc(armc, latitude, obliquity[anchor])
+        ayanamsa = _linear_ayanamsa(jd_anchor[anchor] + dt_days)[:, None]
+        lon_sid = norm_deg(lon_trop[anchor] + speed[anchor] * dt_days[:, None] - ayanamsa)
+        cusps_sid = norm_deg(porphyry_cusps(asc, mc) - ayanamsa)
+
+        yield evaluate_charts(lon_sid, cusps_sid)
+        remaining -= size
+
+
+def _category_counts(rates):
+    """Per-planet count tables (P, values) for each score category"""
+    n_planets = len(PLANET_NAMES)
+    diagonal = np.diagonal(rates['cooccurrence']).astype(np.int64)
+    counts = {}
+    start = 0
+    for name, size in FEATURE_BLOCKS:
+        counts[name] = diagonal[start:start + n_planets * size].reshape(n_planets, size)
+        start += n_planets * size
+    counts["aspect_mask"] = rates['aspect_mask']
+    counts["control_mask"] = rates['control_mask']
+    return {k: counts[k] for k in SCORE_CATEGORIES}
+
+
+def _surprisal_tables(counts, n_charts):
+    # Smoothed so patterns never seen in the sample still get a finite score
+    return {k: -np.log10((c + 0.5) / (n_charts + 1.0)) for k, c in counts.items()}
+
+
+def _chart_scores(charts, surprisal):
+    """Rarity score per chart: summed surprisal of every planet's categorical attributes"""
+    aspect_mask, control_mask = pattern_masks(charts)
+    values = {
+        "house": charts['p_house'] - 1,
+        "sign": charts['p_sign_idx'],
+        "nakshatra": charts['p_nak_idx'],
+        "navamsa": charts['p_nav_idx'],
+        "aspect_mask": aspect_mask,
+        "control_mask": control_mask,
+    }
+    planets = np.arange(len(PLANET_NAMES))
+    return sum(surprisal[k][planets, values[k]].sum(axis=-1) for k in SCORE_CATEGORIES)
+
+
+def build_base_rates(n_charts, batch_size=20000, charts_per_anchor=50, max_latitude=60.0,
+                     score_fraction=0.1, seed=0, log=print):
+    """Sample random charts and accumulate the base-rate cubes"""
+    rng = np.random.default_rng(seed)
+    n_features = len(feature_names())
+    n_planets = len(PLANET_NAMES)
+    cooccurrence = np.zeros((n_features, n_features), dtype=np.int64)
+    aspect_mask_counts = np.zeros((n_planets, 1 << 12), dtype=np.int64)
+    control_mask_counts = np.zeros((n_planets, 1 << n_planets), dtype=np.int64)
+
+    start = time.time()
+    done = 0
+    for charts in _sample_charts(rng, n_charts, batch_size, charts_per_anchor, max_latitude):
+        # float32 products are exact up to 2**24 charts per batch
+        features = chart_features(charts).astype(np.float32)
+        cooccurrence += (features.T @ features).astype(np.int64)
+        aspect_mask, control_mask = pattern_masks(charts)
+        for i in range(n_planets):
+            aspect_mask_counts[i] += np.bincount(aspect_mask[:, i], minlength=1 << 12)
+            control_mask_counts[i] += np.bincount(control_mask[:, i], minlength=1 << n_planets)
+        done += len(features)
+        log(f"cubes: {done:,}/{n_charts:,} charts ({time.time() - start:.0f}s)")
+
+    rates = {
+        'n_charts': np.int64(n_charts),
+        'cooccurrence': cooccurrence,
+        'aspect_mask': aspect_mask_counts,
+        'control_mask': control_mask_counts,
+    }
+
+    # Second, smaller pass: distribution of the rarity score under the cubes
+    surprisal = _surprisal_tables(_category_counts(rates), n_charts)
+    score_hist = np.zeros(SCORE_BINS, dtype=np.int64)
+    n_score = max(int(n_charts * score_fraction), min(n_charts, 10000))
+    for charts in _sample_charts(rng, n_score, batch_size, charts_per_anchor, max_latitude):
+        bins = np.clip((_chart_scores(charts, surprisal) / SCORE_MAX * SCORE_BINS).astype(int), 0, SCORE_BINS - 1)
+        score_hist += np.bincount(bins, minlength=SCORE_BINS)
+    log(f"scores: {n_score:,} charts ({time.time() - start:.0f}s)")
+
+    rates['score_hist'] = score_hist
+    rates['max_latitude'] = np.float64(max_latitude)
+    return rates
+
+
+def save_base_rates(rates, path=BASE_RATES_PATH):
+    """Write the cubes compactly, using the narrowest unsigned integer type that fits"""
+    packed = {}
+    for key, value in rates.items():
+        if key in ('cooccurrence', 'aspect_mask', 'control_mask', 'score_hist'):
+            dtype = np.uint32 if value.max() < 2**32 else np.uint64
+            value = value.astype(dtype)
+        packed[key] = value
+    np.savez_compressed(path, **packed)
+
+
+def load_base_rates(path=BASE_RATES_PATH):
+    """Load the cubes and precompute lookup tables, or return None if not built yet"""
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as data:
+        rates = {key: data[key] for key in data.files}
+    n_charts = int(rates['n_charts'])
+    rates['n_charts'] = n_charts
+    rates['feature_names'] = feature_names()
+    rates['feature_index'] = {name: i for i, name in enumerate(rates['feature_names'])}
+    rates['frequency'] = np.diagonal(rates['cooccurrence']) / n_charts
+    rates['surprisal'] = _surprisal_tables(_category_counts(rates), n_charts)
+    rates['score_cdf'] = np.cumsum(rates['score_hist']) / rates['score_hist'].sum()
+    return rates
+
+
+def combination_frequency(rates, feature_a, feature_b):
+    """Fraction of sampled charts showing both features"""
+    i = rates['feature_index'][feature_a]
+    j = rates['feature_index'][feature_b]
+    return rates['cooccurrence'][i, j] / rates['n_charts']
+
+
+def chart_rarity(rates, charts, top=10):
+    """Rarity figures for one chart in the array form of ``chart_arrays``.
+
+    Returns the rarity score and its percentile among sampled charts, the
+    rarest single features, the rarest aspect/control patterns and the feature
+    pairs that co-occur least often relative to independence.
+    """
+    n_charts = rates['n_charts']
+    names = rates['feature_names']
+    score = float(_chart_scores(charts, rates['surprisal']))
+    score_bin = min(int(score / SCORE_MAX * SCORE_BINS), SCORE_BINS - 1)
+    percentile = float(rates['score_cdf'][score_bin - 1]) * 100 if score_bin > 0 else 0.0
+
+    active = np.flatnonzero(chart_features(charts))
+    frequency = rates['frequency'][active]
+    rarest = np.argsort(frequency, kind="stable")[:top]
+    features = [(names[active[k]], float(frequency[k])) for k in rarest]
+
+    aspect_mask, control_mask = pattern_masks(charts)
+    patterns = []
+    for i, planet in enumerate(PLANET_NAMES):
+        houses = [f"H{h + 1}" for h in range(12) if aspect_mask[i] >> h & 1]
+        controlled = [q for j, q in enumerate(PLANET_NAMES) if control_mask[i] >> j & 1]
+        patterns.append((f"{planet} aspects exactly {', '.join(houses) or 'no house'}",
+                         rates['aspect_mask'][i, aspect_mask[i]] / n_charts))
+        patterns.append((f"{planet} controls exactly {', '.join(controlled) or 'no planet'}",
+                         rates['control_mask'][i, control_mask[i]] / n_charts))
+    patterns.sort(key=lambda item: item[1])
+
+    joint = rates['cooccurrence'][np.ix_(active, active)] / n_charts
+    expected = np.outer(frequency, frequency)
+    ratio = np.divide(joint, expected, out=np.ones_like(joint), where=expected > 0)
+    a, b = np.triu_indices(len(active), k=1)
+    order = np.argsort(ratio[a, b], kind="stable")[:top]
+    pairs = [(names[active[a[k]]], names[active[b[k]]], float(joint[a[k], b[k]]),
+              float(expected[a[k], b[k]]), float(ratio[a[k], b[k]])) for k in order]
+
+    return {
+        'score': score,
+        'percentile': percentile,
+        'features': features,
+        'patterns': patterns[:top],
+        'pairs': pairs,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the base-rate cubes used for chart rarity statistics")
+    parser.add_argument("--charts", type=int, default=2_000_000, help="number of random charts to sample")
+    parser.add_argument("--batch-size", type=int, default=20000, help="charts evaluated per batch")
+    parser.add_argument("--charts-per-anchor", type=int, default=50,
+                        help="charts extrapolated from each exact ephemeris evaluation")
+    parser.add_argument("--max-latitude", type=float, default=60.0, help="sample latitudes within +/- this value")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=BASE_RATES_PATH)
+    args = parser.parse_args()
+
+    rates = build_base_rates(args.charts, args.batch_size, args.charts_per_anchor,
+                             args.max_latitude, seed=args.seed)
+    save_base_rates(rates, args.output)
+    print(f"Wrote {args.output} ({os.path.getsize(args.output) / 1024:.0f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""North and South Indian chart diagrams.
+
+The static layout (frame, house outlines, label anchors) is built once per
+process when this module is imported; rendering a chart only fills in sign,
+house and planet labels plus aspect lines. Rendered output is memoized in
+bounded caches keyed by the chart fingerprint, i.e. the handful of chart
+attributes the diagram actually shows.
+"""
+import hashlib
+import io
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
+
+from PIL import Image, ImageDraw, ImageFont
+
+from chart_engine import PLANET_NAMES
+
+SIZE = 400
+MARGIN = 10
+STYLES = {"north": "North Indian", "south": "South Indian"}
+
+PLANET_ABBR = {
+    "Sun": "Su", "Moon": "Mo", "Mars": "Ma", "Mercury": "Me", "Jupiter": "Ju",
+    "Venus": "Ve", "Saturn": "Sa", "Rahu": "Ra", "Ketu": "Ke"
+}
+
+PLANET_COLORS = {
+    "Sun": "#d35400", "Moon": "#7f8c8d", "Mars": "#c0392b", "Mercury": "#27ae60", "Jupiter": "#b7950b",
+    "Venus": "#8e44ad", "Saturn": "#2c3e50", "Rahu": "#5d6d7e", "Ketu": "#935116"
+}
+
+LINE_COLOR = "#444444"
+LABEL_COLOR = "#888888"
+FONT_SIZE = 14
+SMALL_FONT_SIZE = 11
+
+
+def _px(point):
+    x, y = point
+    return (MARGIN + x * (SIZE - 2 * MARGIN), MARGIN + y * (SIZE - 2 * MARGIN))
+
+
+def _centroid(points):
+    return (sum(x for x, _ in points) / len(points), sum(y for _, y in points) / len(points))
+
+
+def _toward(a, b, t):
+    return (a[0] + (b[0] - a[0]) * t, a[1] + (b[1] - a[1]) * t)
+
+
+def _north_layout():
+    # Unit-square points: corners, edge midpoints, centre and the four points
+    # where the diagonals cross the inner diamond. Houses run counter-clockwise
+    # from the top diamond (H1).
+    TL, TR, BR, BL = (0, 0), (1, 0), (1, 1), (0, 1)
+    T, R, B, L, C = (0.5, 0), (1, 0.5), (0.5, 1), (0, 0.5), (0.5, 0.5)
+    ITL, ITR, IBR, IBL = (0.25, 0.25), (0.75, 0.25), (0.75, 0.75), (0.25, 0.75)
+    houses = [
+        [T, ITL, C, ITR], [TL, T, ITL], [TL, ITL, L], [L, ITL, C, IBL],
+        [L, IBL, BL], [BL, IBL, B], [B, IBL, C, IBR], [B, IBR, BR],
+        [BR, IBR, R], [R, IBR, C, ITR], [R, ITR, TR], [TR, ITR, T],
+    ]
+    slots = []
+    for polygon in houses:
+        centre = _centroid(polygon)
+        inner = min(polygon, key=lambda p: (p[0] - 0.5) ** 2 + (p[1] - 0.5) ** 2)
+        slots.append({
+            'polygon': [_px(p) for p in polygon],
+            'anchor': _px(centre),
+            'label': _px(_toward(centre, inner, 0.55)),
+        })
+    lines = [(TL, BR), (TR, BL), (T, R), (R, B), (B, L), (L, T)]
+    return {'slots': slots, 'lines': [(_px(a), _px(b)) for a, b in lines]}
+
+
+def _south_layout():
+    # Fixed signs around a 4x4 grid, Pisces in the top-left cell and Aries
+    # to its right, running clockwise.
+    cells = [(1, 0), (2, 0), (3, 0), (3, 1), (3, 2), (3, 3),
+             (2, 3), (1, 3), (0, 3), (0, 2), (0, 1), (0, 0)]
+    slots = []
+    for col, row in cells:
+        x, y = col / 4, row / 4
+        polygon = [(x, y), (x + 0.25, y), (x + 0.25, y + 0.25), (x, y + 0.25)]
+        slots.append({
+            'polygon': [_px(p) for p in polygon],
+            'anchor': _px((x + 0.125, y + 0.14)),
+            'label': _px((x + 0.035, y + 0.03)),
+        })
+    lines = [((0.25, 0.25), (0.75, 0.25)), ((0.75, 0.25), (0.75, 0.75)),
+             ((0.75, 0.75), (0.25, 0.75)), ((0.25, 0.75), (0.25, 0.25))]
+    return {'slots': slots, 'lines': [(_px(a), _px(b)) for a, b in lines]}
+
+
+def _static_svg(layout):
+    parts = [f'<rect x="{MARGIN}" y="{MARGIN}" width="{SIZE - 2 * MARGIN}" height="{SIZE - 2 * MARGIN}" '
+             f'fill="#fffdf7" stroke="{LINE_COLOR}" stroke-width="2"/>']
+    for slot in layout['slots']:
+        points = " ".join(f"{x:.1f},{y:.1f}" for x, y in slot['polygon'])
+        parts.append(f'<polygon points="{points}" fill="none" stroke="{LINE_COLOR}" stroke-width="1"/>')
+    for (x1, y1), (x2, y2) in layout['lines']:
+        parts.append(f'<line x1="{x1:.1f}" y1="{y1:.1f}" x2="{x2:.1f}" y2="{y2:.1f}" '
+                     f'stroke="{LINE_COLOR}" stroke-width="1"/>')
+    return "".join(parts)
+
+
+# Precompiled once per process
+_LAYOUTS = {"north": _north_layout(), "south": _south_layout()}
+_STATIC_SVG = {style: _static_svg(layout) for style, layout in _LAYOUTS.items()}
+
+
+def diagram_key(chart_data, min_aspect_strength=100.0):
+    """Hashable fingerprint of everything a diagram shows.
+
+    Sign of each house, sign of each planet, and the houses each planet
+    aspects at ``min_aspect_strength`` or more (strength rounded to %).
+    """
+    return (
+        tuple(chart_data['house_sign_idx'][h] for h in range(1, 13)),
+        tuple(chart_data['p_sign_idx'][p] for p in PLANET_NAMES),
+        tuple(tuple(sorted((h, round(s)) for h, s in chart_data['p_aspects'][p].items()
+                           if s >= min_aspect_strength))
+              for p in PLANET_NAMES),
+    )
+
+
+def chart_fingerprint(chart_data, min_aspect_strength=100.0):
+    """Short hex digest of ``diagram_key``, e.g. for file names"""
+    return hashlib.sha1(repr(diagram_key(chart_data, min_aspect_strength)).encode()).hexdigest()[:16]
+
+
+def _slot_contents(style, key):
+    """Per-slot (label, planets) and aspect lines (from_slot, to_slot, planet, strength)"""
+    house_signs, signs, aspects = key
+    sign_house = {sign: h + 1 for h, sign in enumerate(house_signs)}
+    planets = [[] for _ in range(12)]
+    if style == "north":
+        # Slot = whole-sign house from the ascendant sign; label = sign number.
+        # Planets go by sign so both styles show the same rasi chart.
+        labels = [str(sign + 1) for sign in house_signs]
+        planet_slot = [(sign - house_signs[0]) % 12 for sign in signs]
+        for p, slot in zip(PLANET_NAMES, planet_slot):
+            planets[slot].append(p)
+        house_slot = list(range(12))
+    else:
+        # Slot = sign; label = house number, with the ascendant marked
+        labels = [("Asc" if sign_house[s] == 1 else str(sign_house[s])) for s in range(12)]
+        for p, sign in zip(PLANET_NAMES, signs):
+            planets[sign].append(p)
+        planet_slot = list(signs)
+        house_slot = list(house_signs)
+
+    lines = []
+    for i, p in enumerate(PLANET_NAMES):
+        for house, strength in aspects[i]:
+            target = house_slot[house - 1]
+            if target != planet_slot[i]:
+                lines.append((planet_slot[i], target, p, strength))
+    return labels, planets, lines
+
+
+def _line_opacity(strength):
+    return 0.15 + 0.35 * strength / 100
+
+
+def _planet_rows(planets):
+    abbrs = [PLANET_ABBR[p] for p in planets]
+    return [abbrs[i:i + 3] for i in range(0, len(abbrs), 3)]
+
+
+@lru_cache(maxsize=1024)
+def _svg_from_key(style, key):
+    layout = _LAYOUTS[style]
+    slots = layout['slots']
+    labels, planets, lines = _slot_contents(style, key)
+
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{SIZE}" height="{SIZE}" '
+             f'viewBox="0 0 {SIZE} {SIZE}" font-family="sans-serif">', _STATIC_SVG[style]]
+    for source, target, planet, strength in lines:
+        (x1, y1), (x2, y2) = slots[source]['anchor'], slots[target]['anchor']
+        parts.append(f'<line x1="{x1:.1f}" y1="{y1:.1f}" x2="{x2:.1f}" y2="{y2:.1f}" '
+                     f'stroke="{PLANET_COLORS[planet]}" stroke-width="1.5" '
+                     f'stroke-opacity="{_line_opacity(strength):.2f}"/>')
+    for slot, label, occupants in zip(slots, labels, planets):
+        x, y = slot['label']
+        anchor = "middle" if style == "north" else "start"
+        parts.append(f'<text x="{x:.1f}" y="{y:.1f}" font-size="{SMALL_FONT_SIZE}" fill="{LABEL_COLOR}" '
+                     f'text-anchor="{anchor}" dominant-baseline="hanging">{label}</text>')
+        x, y = slot['anchor']
+        rows = _planet_rows(occupants)
+        for r, row in enumerate(rows):
+            ry = y + (r - (len(rows) - 1) / 2) * (FONT_SIZE + 2)
+            text = " ".join(row)
+            parts.append(f'<text x="{x:.1f}" y="{ry:.1f}" font-size="{FONT_SIZE}" font-weight="bold" '
+                         f'text-anchor="middle" dominant-baseline="middle">{text}</text>')
+    parts.append("</svg>")
+    return "".join(parts)
+
+
+@lru_cache(maxsize=None)
+def _font(size):
+    return ImageFont.load_default(size=size)
+
+
+@lru_cache(maxsize=None)
+def _static_image(style, scale):
+    """Frame and house outlines, drawn once per style and scale"""
+    layout = _LAYOUTS[style]
+
+    def s(point):
+        return (point[0] * scale, point[1] * scale)
+
+    image = Image.new("RGBA", (SIZE * scale, SIZE * scale), "#fffdf7")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle([s((MARGIN, MARGIN)), s((SIZE - MARGIN, SIZE - MARGIN))], outline=LINE_COLOR, width=2 * scale)
+    for slot in layout['slots']:
+        draw.polygon([s(p) for p in slot['polygon']], outline=LINE_COLOR, width=scale)
+    for a, b in layout['lines']:
+        draw.line([s(a), s(b)], fill=LINE_COLOR, width=scale)
+    return image
+
+
+@lru_cache(maxsize=256)
+def _image_from_key(style, key, fmt, scale):
+    slots = _LAYOUTS[style]['slots']
+    labels, planets, lines = _slot_contents(style, key)
+
+    def s(point):
+        return (point[0] * scale, point[1] * scale)
+
+    image = _static_image(style, scale)
+    overlay = Image.new("RGBA", image.size, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(overlay)
+    for source, target, planet, strength in lines:
+        alpha = int(255 * _line_opacity(strength))
+        color = tuple(int(PLANET_COLORS[planet][i:i + 2], 16) for i in (1, 3, 5)) + (alpha,)
+        draw.line([s(slots[source]['anchor']), s(slots[target]['anchor'])], fill=color, width=2 * scale)
+    image = Image.alpha_composite(image, overlay)
+
+    draw = ImageDraw.Draw(image)
+    font = _font(FONT_SIZE * scale)
+    small_font = _font(SMALL_FONT_SIZE * scale)
+    for slot, label, occupants in zip(slots, labels, planets):
+        draw.text(s(slot['label']), label, fill=LABEL_COLOR, font=small_font,
+                  anchor="mt" if style == "north" else "lt")
+        x, y = slot['anchor']
+        rows = _planet_rows(occupants)
+        for r, row in enumerate(rows):
+            ry = y + (r - (len(rows) - 1) / 2) * (FONT_SIZE + 2)
+            draw.text(s((x, ry)), " ".join(row), fill="black", font=font, anchor="mm")
+
+    buffer = io.BytesIO()
+    if fmt == "pdf":
+        image.convert("RGB").save(buffer, format="PDF", resolution=72.0 * scale)
+    else:
+        image.convert("RGB").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def render_key(key, style="north", fmt="svg", scale=2):
+    """Render a ``diagram_key`` as SVG text or PNG/PDF bytes"""
+    if style not in _LAYOUTS:
+        raise ValueError(f"Unknown chart style {style!r}; expected one of {sorted(_LAYOUTS)}")
+    if fmt == "svg":
+        return _svg_from_key(style, key)
+    if fmt in ("png", "pdf"):
+        return _image_from_key(style, key, fmt, scale)
+    raise ValueError(f"Unknown format {fmt!r}; expected 'svg', 'png' or 'pdf'")
+
+
+def chart_svg(chart_data, style="north", min_aspect_strength=100.0):
+    return render_key(diagram_key(chart_data, min_aspect_strength), style, "svg")
+
+
+def chart_image(chart_data, style="north", fmt="png", min_aspect_strength=100.0, scale=2):
+    return render_key(diagram_key(chart_data, min_aspect_strength), style, fmt, scale)
+
+
+def render_batch(charts, style="north", fmt="svg", min_aspect_strength=100.0, workers=None, chunksize=64):
+    """Render many charts in parallel worker processes, preserving input order.
+
+    Only the compact diagram keys are sent to the workers; each worker builds
+    the layouts once on import and keeps its own render cache.
+    """
+    keys = [diagram_key(chart, min_aspect_strength) for chart in charts]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(render_key, keys, repeat(style), repeat(fmt), chunksize=chunksize))
@@ -0,0 +1,398 @@
+"""Vectorized chart calculations.
+
+These mirror the per-planet rules in ``streamlit_app.py`` (Sripati house
+boundaries, orb-based aspects, one-sided controlling aspects) with NumPy
+broadcasting, so many chart variants can be derived from one ephemeris pass.
+Every function accepts arbitrary leading batch dimensions.
+"""
+import numpy as np
+import swisseph as swe
+
+PLANET_NAMES = ["Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Rahu", "Ketu"]
+
+SIGN_NAMES = ["Aries","Taurus","Gemini","Cancer","Leo","Virgo","Libra","Scorpio",
+              "Sagittarius","Capricorn","Aquarius","Pisces"]
+
+NAKSHATRA_NAMES = ["Ashvini","Bharani","Krittika","Rohini","Mrigashira","Ardra","Punarvasu","Pushya","Ashlesha",
+                   "Magha","Purva Phalguni","Uttara Phalguni","Hasta","Chitra","Swati","Vishakha","Anuradha","Jyeshtha",
+                   "Mula","Purva Ashadha","Uttara Ashadha","Shravana","Dhanishta","Shatabhisha","Purva Bhadrapada",
+                   "Uttara Bhadrapada","Revati"]
+
+PLANET_ORBS = {
+    "Sun": 15, "Moon": 12, "Venus": 7, "Mercury": 7,
+    "Saturn": 9, "Mars": 9, "Jupiter": 9, "Rahu": 15, "Ketu": 15
+}
+
+PLANET_ASPECTS = {
+    "Sun": [7], "Moon": [7], "Mercury": [7], "Venus": [7],
+    "Mars": [4, 7, 8], "Jupiter": [5, 7, 9], "Saturn": [3, 7, 10],
+    "Rahu": [5, 7, 9], "Ketu": [5, 7, 9]
+}
+
+SIGN_LORD = {
+    "Sun": [4], "Moon": [3], "Mars": [0,7], "Mercury": [2,5],
+    "Jupiter": [8,11], "Venus": [1,6], "Saturn": [9,10],
+    "Rahu": [5], "Ketu": [11],
+}
+
+NAKSHATRA_LORD = {
+    "Ketu": [0, 9, 18], "Venus": [1, 10, 19], "Sun": [2, 11, 20],
+    "Moon": [3, 12, 21], "Mars": [4, 13, 22], "Rahu": [5, 14, 23],
+    "Jupiter": [6, 15, 24], "Saturn": [7, 16, 25], "Mercury": [8, 17, 26],
+}
+
+# Aspect distance (in houses) -> offset of the aspect point in degrees
+ASPECT_OFFSETS = {3: 60, 4: 90, 5: 120, 7: 180, 8: 210, 9: 240, 10: 270}
+
+# Linear ayanamsa model used by the chart page: value at 1900-01-01 plus a
+# constant precession rate
+AYANAMSA_1900_DEG = 22 + 33/60 + 38.81/3600
+PRECESSION_RATE_ARCSEC_PER_YEAR = 50.278658
+
+AYANAMSA_MODELS = {
+    "Current (linear)": None,
+    "Lahiri": swe.SIDM_LAHIRI,
+    "Raman": swe.SIDM_RAMAN,
+    "KP": swe.SIDM_KRISHNAMURTI,
+}
+
+HOUSE_SYSTEMS = ["Sripati (Porphyry)", "Placidus", "Equal"]
+
+# House systems whose cusps mark the middle of a house rather than its start
+MIDPOINT_SYSTEMS = {"Sripati (Porphyry)"}
+
+# Rate of change of the sidereal time (ARMC) per day of UT
+SIDEREAL_DEG_PER_DAY = 360.98564736629
+
+# Per-planet lookup arrays in PLANET_NAMES order
+_ORB = np.array([PLANET_ORBS[p] for p in PLANET_NAMES], dtype=float)
+_MAX_ASPECTS = max(len(a) for a in PLANET_ASPECTS.values())
+_OFFSETS = np.zeros((len(PLANET_NAMES), _MAX_ASPECTS))
+_OFFSET_VALID = np.zeros((len(PLANET_NAMES), _MAX_ASPECTS), dtype=bool)
+for _i, _p in enumerate(PLANET_NAMES):
+    for _k, _dist in enumerate(PLANET_ASPECTS[_p]):
+        _OFFSETS[_i, _k] = ASPECT_OFFSETS[_dist]
+        _OFFSET_VALID[_i, _k] = True
+_NAVAMSA_START = np.array([0, 8, 4])
+_SIGN_RULED = np.array([[s in SIGN_LORD[p] for s in range(12)] for p in PLANET_NAMES])
+_NAKSHATRA_RULED = np.array([[n in NAKSHATRA_LORD[p] for n in range(27)] for p in PLANET_NAMES])
+
+
+def norm_deg(x):
+    return np.mod(x, 360.0)
+
+
+def _circ_dist(a, b):
+    d = np.abs(a - b)
+    return np.minimum(d, 360 - d)
+
+
+def sign_index(lon):
+    return np.floor(norm_deg(lon) / 30.0).astype(int) % 12
+
+
+def nakshatra_index(lon):
+    return np.floor(norm_deg(lon) / (360.0/27.0)).astype(int) % 27
+
+
+def navamsa_sign_index(lon_sid):
+    s = sign_index(lon_sid)
+    within = norm_deg(lon_sid) - s*30.0
+    p = np.floor(within / (30.0/9.0)).astype(int)
+    return (s + _NAVAMSA_START[s % 3] + p) % 12
+
+
+def house_sign_index(asc_sid):
+    """Sign index of houses 1-12 (last axis), sequential from the ascendant sign"""
+    return (sign_index(asc_sid)[..., None] + np.arange(12)) % 12
+
+
+def porphyry_cusps(asc, mc):
+    """Porphyry (Sripati) cusps from the ascendant and midheaven"""
+    asc = np.asarray(asc, dtype=float)
+    mc = np.asarray(mc, dtype=float)
+    ic = norm_deg(mc + 180.0)
+    east = norm_deg(ic - asc)    # arc from H1 to H4 (and H7 to H10)
+    west = 180.0 - east          # arc from H4 to H7 (and H10 to H1)
+    steps = np.arange(3) / 3.0
+    quadrants = [
+        asc[..., None] + east[..., None] * steps,
+        ic[..., None] + west[..., None] * steps,
+        asc[..., None] + 180.0 + east[..., None] * steps,
+        mc[..., None] + west[..., None] * steps,
+    ]
+    return norm_deg(np.concatenate(quadrants, axis=-1))
+
+
+def equal_cusps(asc):
+    return norm_deg(np.asarray(asc, dtype=float)[..., None] + 30.0 * np.arange(12))
+
+
+def angles_from_armc(armc, latitude, obliquity):
+    """Tropical ascendant and midheaven from the ARMC, geographic latitude and obliquity"""
+    t = np.radians(armc)
+    e = np.radians(obliquity)
+    f = np.radians(latitude)
+    mc = np.degrees(np.arctan2(np.sin(t), np.cos(t) * np.cos(e)))
+    asc = np.degrees(np.arctan2(np.cos(t), -(np.sin(t) * np.cos(e) + np.tan(f) * np.sin(e))))
+    return norm_deg(asc), norm_deg(mc)
+
+
+def house_placement(lon, cusps, midpoints=True):
+    """House (1-12) of each longitude, 0 if none matched.
+
+    With ``midpoints`` houses run between the midpoints of adjacent cusps
+    (Sripati, cusp at the middle of the house); otherwise each house starts
+    at its own cusp and ends at the next one (Placidus, Equal).
+    ``lon`` has shape (..., P) and ``cusps`` (..., 12); the result is (..., P).
+    """
+    if midpoints:
+        prev = np.roll(cusps, 1, axis=-1)
+        start = np.where(prev > cusps, norm_deg((prev + cusps + 360) / 2), norm_deg((prev + cusps) / 2))
+    else:
+        start = cusps
+    end = np.roll(start, -1, axis=-1)
+    lon = lon[..., :, None]
+    start = start[..., None, :]
+    end = end[..., None, :]
+    inside = np.where(start > end, (lon >= start) | (lon < end), (start <= lon) & (lon < end))
+    return np.where(inside.any(axis=-1), inside.argmax(axis=-1) + 1, 0)
+
+
+def aspect_strengths(lon, cusps):
+    """Aspect strength (0-100) of each planet on each house cusp, 0 where there is none.
+
+    ``lon`` has shape (..., P) in PLANET_NAMES order and ``cusps`` (..., 12);
+    the result is (..., P, 12).
+    """
+    # The orb window is symmetric about the aspect point, so a cusp is in orb
+    # when its distance to the point is within the orb, and otherwise its
+    # distance to the nearest window boundary is that distance minus the orb.
+    orb = _ORB[:, None, None]
+    point = norm_deg(lon[..., :, None] + _OFFSETS)
+    boundary_dist = _circ_dist(cusps[..., None, None, :], point[..., None]) - orb
+    strength = np.exp(-np.maximum(boundary_dist, 0.0) / orb) * 100
+    strength[(boundary_dist > orb * 2) | ~_OFFSET_VALID[:, :, None]] = 0.0
+    return strength.max(axis=-2)
+
+
+def controlling_matrix(lon):
+    """Boolean (..., P, P) matrix, True where planet i controls planet j.
+
+    A planet controls another when it aspects it (orb + 2 degree grace) and
+    the other planet does not aspect it back.
+    """
+    point = norm_deg(lon[..., :, None] + _OFFSETS)
+    diff = _circ_dist(lon[..., None, None, :], point[..., None])
+    hits = (diff <= (_ORB + 2)[:, None, None]) & _OFFSET_VALID[:, :, None]
+    aspects = hits.any(axis=-2)
+    return aspects & ~np.swapaxes(aspects, -1, -2) & ~np.eye(len(PLANET_NAMES), dtype=bool)
+
+
+def ayanamsa_values(jd_ut, models, current_deg):
+    """Ayanamsa in degrees for each named model; the linear model reuses ``current_deg``"""
+    values = []
+    for model in models:
+        mode = AYANAMSA_MODELS[model]
+        if mode is None:
+            values.append(current_deg)
+        else:
+            swe.set_sid_mode(mode)
+            values.append(swe.get_ayanamsa_ut(jd_ut))
+    return np.array(values)
+
+
+def tropical_cusps(jd_ut, latitude, longitude, systems):
+    """Tropical cusps {system: (12,)} for each house system that has a solution.
+
+    The ascendant and MC come from a Porphyry call, which works at every
+    latitude; swisseph is only asked for Placidus when it is selected, and
+    Placidus is left out where it has no solution (beyond the polar circles).
+    """
+    _, ascmc = swe.houses(jd_ut, latitude, longitude, b'O')
+    asc, mc = ascmc[0], ascmc[1]
+    cusps = {}
+    for system in systems:
+        if system == "Sripati (Porphyry)":
+            cusps[system] = porphyry_cusps(asc, mc)
+        elif system == "Equal":
+            cusps[system] = equal_cusps(asc)
+        elif system == "Placidus":
+            try:
+                cusps[system] = np.array(swe.houses(jd_ut, latitude, longitude, b'P')[0])
+            except swe.Error:
+                continue
+    return cusps
+
+
+def _aspect_dict(strengths):
+    return {h + 1: float(s) for h, s in enumerate(strengths) if s > 0}
+
+
+def chart_variants(chart_data, ayanamsas, systems):
+    """Derive every (ayanamsa, house system) variant of a generated chart.
+
+    Reuses the tropical planet longitudes stored in ``chart_data`` and makes at
+    most two swe.houses calls; all variants are then offsets of the same arrays.
+    Returns {(ayanamsa, system): variant} where each variant uses the same keys
+    as ``chart_data``. House systems without a solution at the birth latitude
+    are omitted.
+    """
+    lon_trop = np.array([chart_data['planet_lon_trop'][p] for p in PLANET_NAMES])
+    ayan = ayanamsa_values(chart_data['jd_ut'], ayanamsas, chart_data['ayanamsa_deg'])
+    available = tropical_cusps(chart_data['jd_ut'], chart_data['latitude'], chart_data['longitude'], systems)
+    systems = [s for s in systems if s in available]
+    if not systems:
+        return {}
+    cusps_trop = np.array([available[s] for s in systems])
+
+    lon_sid = norm_deg(lon_trop - ayan[:, None])                        # (A, P)
+    cusps_sid = norm_deg(cusps_trop[None, :, :] - ayan[:, None, None])  # (A, S, 12)
+
+    midpoints = np.array([s in MIDPOINT_SYSTEMS for s in systems])[None, :, None]
+    houses = np.where(midpoints,                                       # (A, S, P)
+                      house_placement(lon_sid[:, None, :], cusps_sid),
+                      house_placement(lon_sid[:, None, :], cusps_sid, midpoints=False))
+    aspects = aspect_strengths(lon_sid[:, None, :], cusps_sid)         # (A, S, P, 12)
+    house_signs = house_sign_index(cusps_sid[..., 0])                  # (A, S, 12)
+    signs = sign_index(lon_sid)                                        # (A, P)
+    naks = nakshatra_index(lon_sid)
+    navs = navamsa_sign_index(lon_sid)
+    control = controlling_matrix(lon_sid)                              # (A, P, P)
+
+    variants = {}
+    for a, ayanamsa in enumerate(ayanamsas):
+        controlling = {p: [q for j, q in enumerate(PLANET_NAMES) if control[a, i, j]]
+                       for i, p in enumerate(PLANET_NAMES)}
+        for s, system in enumerate(systems):
+            variants[(ayanamsa, system)] = {
+                'ayanamsa_deg': float(ayan[a]),
+                'cusps_sid': {h + 1: float(cusps_sid[a, s, h]) for h in range(12)},
+                'p_house': {p: int(houses[a, s, i]) or None for i, p in enumerate(PLANET_NAMES)},
+                'p_aspects': {p: _aspect_dict(aspects[a, s, i]) for i, p in enumerate(PLANET_NAMES)},
+                'p_controlling': controlling,
+                'p_sign_idx': {p: int(signs[a, i]) for i, p in enumerate(PLANET_NAMES)},
+                'p_nak_idx': {p: int(naks[a, i]) for i, p in enumerate(PLANET_NAMES)},
+                'p_nav_idx': {p: int(navs[a, i]) for i, p in enumerate(PLANET_NAMES)},
+                'house_sign_idx': {h + 1: int(house_signs[a, s, h]) for h in range(12)},
+            }
+    return variants
+
+
+def chart_differences(base, other):
+    """Rows describing where ``other`` differs from ``base`` per planet and attribute"""
+    def houses_ruled(chart, planet):
+        ruled = [h for h in range(1, 13) if chart['house_sign_idx'][h] in SIGN_LORD[planet]]
+        return ", ".join(str(h) for h in ruled) if ruled else "None"
+
+    def aspect_str(chart, planet):
+        aspects = chart['p_aspects'][planet]
+        if not aspects:
+            return "None"
+        return ", ".join(f"H{h}({strength:.0f}%)" for h, strength in sorted(aspects.items()))
+
+    attributes = [
+        ("House Placed In", lambda c, p: c['p_house'][p], lambda c, p: c['p_house'][p]),
+        ("Houses Ruled", houses_ruled, houses_ruled),
+        ("Sign", lambda c, p: c['p_sign_idx'][p], lambda c, p: SIGN_NAMES[c['p_sign_idx'][p]]),
+        ("Nakshatra", lambda c, p: c['p_nak_idx'][p], lambda c, p: NAKSHATRA_NAMES[c['p_nak_idx'][p]]),
+        ("Navamsa", lambda c, p: c['p_nav_idx'][p], lambda c, p: SIGN_NAMES[c['p_nav_idx'][p]]),
+        ("Houses Aspecting", lambda c, p: sorted(c['p_aspects'][p]), aspect_str),
+        ("Planets It's Controlling", lambda c, p: c['p_controlling'][p],
+         lambda c, p: ", ".join(c['p_controlling'][p]) or "None"),
+    ]
+
+    rows = []
+    for planet in PLANET_NAMES:
+        for attribute, key, label in attributes:
+            if key(base, planet) != key(other, planet):
+                rows.append({
+                    "Planet": planet,
+                    "Attribute": attribute,
+                    "Generated Chart": str(label(base, planet)),
+                    "Variant": str(label(other, planet)),
+                })
+    return rows
+
+
+def evaluate_charts(lon_sid, cusps_sid):
+    """Chart attributes as arrays from sidereal planet longitudes (..., P) and cusps (..., 12)"""
+    return {
+        'p_house': house_placement(lon_sid, cusps_sid),
+        'p_aspects': aspect_strengths(lon_sid, cusps_sid),
+        'p_controlling': controlling_matrix(lon_sid),
+        'p_sign_idx': sign_index(lon_sid),
+        'p_nak_idx': nakshatra_index(lon_sid),
+        'p_nav_idx': navamsa_sign_index(lon_sid),
+        'house_sign_idx': house_sign_index(cusps_sid[..., 0]),
+    }
+
+
+def chart_arrays(chart_data):
+    """Array form (as returned by evaluate_charts) of a generated ``chart_data`` dict"""
+    aspects = np.zeros((len(PLANET_NAMES), 12))
+    controlling = np.zeros((len(PLANET_NAMES), len(PLANET_NAMES)), dtype=bool)
+    for i, p in enumerate(PLANET_NAMES):
+        for house, strength in chart_data['p_aspects'][p].items():
+            aspects[i, house - 1] = strength
+        for q in chart_data['p_controlling'][p]:
+            controlling[i, PLANET_NAMES.index(q)] = True
+    return {
+        'p_house': np.array([chart_data['p_house'][p] or 0 for p in PLANET_NAMES]),
+        'p_aspects': aspects,
+        'p_controlling': controlling,
+        'p_sign_idx': np.array([chart_data['p_sign_idx'][p] for p in PLANET_NAMES]),
+        'p_nak_idx': np.array([chart_data['p_nak_idx'][p] for p in PLANET_NAMES]),
+        'p_nav_idx': np.array([chart_data['p_nav_idx'][p] for p in PLANET_NAMES]),
+        'house_sign_idx': np.array([chart_data['house_sign_idx'][h] for h in range(1, 13)]),
+    }
+
+
+def sample_birth_data(chart_data, n_samples, time_error_min, lat_error_deg, lon_error_deg, seed=0):
+    """Chart attributes for random perturbations of the birth time and place.
+
+    Offsets are drawn uniformly within the error bars. Planets are
+    extrapolated linearly from the stored positions and daily speeds, and
+    Sripati cusps are rebuilt from the perturbed ARMC, so the whole sample is
+    evaluated from one ephemeris pass. Returns arrays with a leading sample axis.
+    """
+    rng = np.random.default_rng(seed)
+    dt_days = rng.uniform(-time_error_min, time_error_min, n_samples) / 1440.0
+    lat = np.clip(chart_data['latitude'] + rng.uniform(-lat_error_deg, lat_error_deg, n_samples), -89.9, 89.9)
+    dlon = rng.uniform(-lon_error_deg, lon_error_deg, n_samples)
+
+    jd_ut = chart_data['jd_ut']
+    _, ascmc = swe.houses(jd_ut, chart_data['latitude'], chart_data['longitude'], b'O')
+    obliquity = swe.calc_ut(jd_ut, swe.ECL_NUT)[0][0]
+    armc = ascmc[2] + dt_days * SIDEREAL_DEG_PER_DAY + dlon
+    asc, mc = angles_from_armc(armc, lat, obliquity)
+
+    ayanamsa = chart_data['ayanamsa_deg']
+    lon_trop = np.array([chart_data['planet_lon_trop'][p] for p in PLANET_NAMES])
+    speed = np.array([chart_data['planet_speed'][p] for p in PLANET_NAMES])
+    lon_sid = norm_deg(lon_trop + speed * dt_days[:, None] - ayanamsa)     # (N, P)
+    cusps_sid = norm_deg(porphyry_cusps(asc, mc) - ayanamsa)               # (N, 12)
+    return evaluate_charts(lon_sid, cusps_sid)
+
+
+def activation_mask(charts, aspects_only=False):
+    """Boolean (..., P, 12) mask of the houses each planet activates in a dasha.
+
+    Mirrors the dasha analysis: a planet activates the houses it aspects,
+    occupies and rules, plus those of every planet placed in its signs,
+    nakshatras or navamsas. With ``aspects_only`` only aspected houses count.
+    """
+    planets = np.arange(len(PLANET_NAMES))
+    direct = charts['p_aspects'] > 0
+    if not aspects_only:
+        placed = charts['p_house'][..., None] == np.arange(1, 13)
+        rules = _SIGN_RULED[planets[:, None], charts['house_sign_idx'][..., None, :]]
+        direct = direct | placed | rules
+
+    # related[..., p, q]: q sits in a sign, nakshatra or navamsa ruled by p
+    related = (_SIGN_RULED[planets[:, None], charts['p_sign_idx'][..., None, :]]
+               | _NAKSHATRA_RULED[planets[:, None], charts['p_nak_idx'][..., None, :]]
+               | _SIGN_RULED[planets[:, None], charts['p_nav_idx'][..., None, :]])
+    related &= ~np.eye(len(PLANET_NAMES), dtype=bool)
+    via = (related[..., :, :, None] & direct[..., None, :, :]).any(axis=-2)
+    return direct | via
@@ -1,8 +1,18 @@
 import streamlit as st
 import math
+import os
+import numpy as np
 from datetime import datetime, timezone, timedelta
 import pandas as pd
 import swisseph as swe
+from chart_engine import (
+    AYANAMSA_MODELS, HOUSE_SYSTEMS, PLANET_NAMES, SIGN_NAMES, NAKSHATRA_NAMES,
+    PLANET_ORBS, PLANET_ASPECTS, ASPECT_OFFSETS, SIGN_LORD, NAKSHATRA_LORD,
+    AYANAMSA_1900_DEG, PRECESSION_RATE_ARCSEC_PER_YEAR,
+    chart_variants, chart_differences, sample_birth_data, activation_mask, chart_arrays
+)
+from base_rates import BASE_RATES_PATH, load_base_rates, chart_rarity, combination_frequency
+from chart_diagrams import STYLES, chart_svg, chart_image, chart_fingerprint
 
 st.set_page_config(
     page_title="Vedic Astrology Chart Analysis",
@@ -59,6 +69,38 @@ location_name = st.sidebar.text_input(
     value="Kolhapur"
 )
 
+# Error bars for the sensitivity analysis
+st.sidebar.subheader("Birth Data Uncertainty")
+time_error_min = st.sidebar.number_input(
+    "Time uncertainty (± minutes)",
+    value=15,
+    min_value=0,
+    max_value=720,
+    step=5
+)
+
+lat_error_deg = st.sidebar.number_input(
+    "Latitude uncertainty (± degrees)",
+    value=0.1,
+    min_value=0.0,
+    max_value=10.0,
+    format="%.3f"
+)
+
+lon_error_deg = st.sidebar.number_input(
+    "Longitude uncertainty (± degrees)",
+    value=0.1,
+    min_value=0.0,
+    max_value=10.0,
+    format="%.3f"
+)
+
+n_samples = st.sidebar.select_slider(
+    "Sensitivity samples",
+    options=[1000, 2000, 5000, 10000, 20000],
+    value=10000
+)
+
 # Generate button
 # Initialize session state for chart data
 if 'chart_generated' not in st.session_state:
@@ -81,18 +123,13 @@ if st.sidebar.button("🔮 Generate Chart", type="primary"):
         return int(math.floor(norm_deg(lon) / 30.0))
     
     def sign_name(idx):
-        return ["Aries","Taurus","Gemini","Cancer","Leo","Virgo","Libra","Scorpio",
-                "Sagittarius","Capricorn","Aquarius","Pisces"][idx % 12]
+        return SIGN_NAMES[idx % 12]
 
     def nakshatra_index(lon):
         return int(math.floor(norm_deg(lon) / (360.0/27.0)))
     
     def nakshatra_name(idx):
-        names = ["Ashvini","Bharani","Krittika","Rohini","Mrigashira","Ardra","Punarvasu","Pushya","Ashlesha",
-                "Magha","Purva Phalguni","Uttara Phalguni","Hasta","Chitra","Swati","Vishakha","Anuradha","Jyeshtha",
-                "Mula","Purva Ashadha","Uttara Ashadha","Shravana","Dhanishta","Shatabhisha","Purva Bhadrapada",
-                "Uttara Bhadrapada","Revati"]
-        return names[idx % 27]
+        return NAKSHATRA_NAMES[idx % 27]
 
     def navamsa_sign_index(lon_sid):
         s = sign_index(lon_sid)
@@ -111,13 +148,11 @@ if st.sidebar.button("🔮 Generate Chart", type="primary"):
 
     # Ayanamsha calculation
     reference_date = datetime(1900, 1, 1)
-    ayanamsa_1900_deg = 22 + 33/60 + 38.81/3600
-    precession_rate_arcsec_per_year = 50.278658
-    precession_rate_deg_per_year = precession_rate_arcsec_per_year / 3600
+    precession_rate_deg_per_year = PRECESSION_RATE_ARCSEC_PER_YEAR / 3600
     
     birth_date_only = datetime(birth_local.year, birth_local.month, birth_local.day)
     years_elapsed = (birth_date_only - reference_date).days / 365.25
-    ayanamsa_deg = ayanamsa_1900_deg + (years_elapsed * precession_rate_deg_per_year)
+    ayanamsa_deg = AYANAMSA_1900_DEG + (years_elapsed * precession_rate_deg_per_year)
     
     # Julian day calculation
     utc = birth_local.astimezone(timezone.utc)
@@ -137,16 +172,22 @@ if st.sidebar.button("🔮 Generate Chart", type="primary"):
     ]
 
     # Calculate planetary positions
-    FLAGS = swe.FLG_SWIEPH
+    FLAGS = swe.FLG_SWIEPH | swe.FLG_SPEED
     planet_lon_sid = {}
+    planet_lon_trop = {}
+    planet_speed = {}
     for name, pid in PLANETS:
         if name == "Ketu":
             continue
         coords, status = swe.calc_ut(jd_ut, pid, FLAGS)
         lon_trop, latp, dist, lon_speed, _, _ = coords
+        planet_lon_trop[name] = lon_trop
+        planet_speed[name] = lon_speed
         planet_lon_sid[name] = norm_deg(lon_trop - ayanamsa_deg)
     
     planet_lon_sid["Ketu"] = norm_deg(planet_lon_sid["Rahu"] + 180.0)
+    planet_lon_trop["Ketu"] = norm_deg(planet_lon_trop["Rahu"] + 180.0)
+    planet_speed["Ketu"] = planet_speed["Rahu"]
 
     # House calculations
     house_system = b'O'  # Sripati
@@ -205,17 +246,8 @@ if st.sidebar.button("🔮 Generate Chart", type="primary"):
     p_nav_idx = {p: navamsa_sign_index(lon) for p, lon in planet_lon_sid.items()}
     p_nav_name = {p: sign_name(idx) for p, idx in p_nav_idx.items()}
 
-    # Planetary orbs and aspects
-    PLANET_ORBS = {
-        "Sun": 15, "Moon": 12, "Venus": 7, "Mercury": 7,
-        "Saturn": 9, "Mars": 9, "Jupiter": 9, "Rahu": 15, "Ketu": 15
-    }
-
-    PLANET_ASPECTS = {
-        "Sun": [7], "Moon": [7], "Mercury": [7], "Venus": [7],
-        "Mars": [4, 7, 8], "Jupiter": [5, 7, 9], "Saturn": [3, 7, 10],
-        "Rahu": [5, 7, 9], "Ketu": [5, 7, 9]
-    }
+    # Planetary orbs, aspects and lords come from chart_engine (PLANET_ORBS,
+    # PLANET_ASPECTS, ASPECT_OFFSETS, SIGN_LORD, NAKSHATRA_LORD)
 
     # Aspect calculations (simplified version)
     def get_planetary_aspects(planet_name, planet_lon, planet_house):
@@ -227,22 +259,9 @@ if st.sidebar.button("🔮 Generate Chart", type="primary"):
         aspect_distances = PLANET_ASPECTS.get(planet_name, [7])
         
         for aspect_distance in aspect_distances:
-            if aspect_distance == 7:
-                aspect_point = norm_deg(planet_lon + 180)
-            elif aspect_distance == 4:
-                aspect_point = norm_deg(planet_lon + 90)
-            elif aspect_distance == 8:
-                aspect_point = norm_deg(planet_lon + 210)
-            elif aspect_distance == 3:
-                aspect_point = norm_deg(planet_lon + 60)
-            elif aspect_distance == 10:
-                aspect_point = norm_deg(planet_lon + 270)
-            elif aspect_distance == 5:
-                aspect_point = norm_deg(planet_lon + 120)
-            elif aspect_distance == 9:
-                aspect_point = norm_deg(planet_lon + 240)
-            else:
+            if aspect_distance not in ASPECT_OFFSETS:
                 continue
+            aspect_point = norm_deg(planet_lon + ASPECT_OFFSETS[aspect_distance])
             
             aspect_start = norm_deg(aspect_point - orb)
             aspect_end = norm_deg(aspect_point + orb)
@@ -293,22 +312,9 @@ if st.sidebar.button("🔮 Generate Chart", type="primary"):
             this_aspects_other = False
             for aspect_distance in aspect_distances:
                 # Calculate aspect point
-                if aspect_distance == 7:
-                    aspect_point = norm_deg(planet_lon + 180)
-                elif aspect_distance == 4:
-                    aspect_point = norm_deg(planet_lon + 90)
-                elif aspect_distance == 8:
-                    aspect_point = norm_deg(planet_lon + 210)
-                elif aspect_distance == 3:
-                    aspect_point = norm_deg(planet_lon + 60)
-                elif aspect_distance == 10:
-                    aspect_point = norm_deg(planet_lon + 270)
-                elif aspect_distance == 5:
-                    aspect_point = norm_deg(planet_lon + 120)
-                elif aspect_distance == 9:
-                    aspect_point = norm_deg(planet_lon + 240)
-                else:
+                if aspect_distance not in ASPECT_OFFSETS:
                     continue
+                aspect_point = norm_deg(planet_lon + ASPECT_OFFSETS[aspect_distance])
                 
                 # Check if other planet falls within this aspect's orb
                 diff = abs(other_lon - aspect_point)
@@ -327,22 +333,9 @@ if st.sidebar.button("🔮 Generate Chart", type="primary"):
                 
                 for other_aspect_distance in other_aspect_distances:
                     # Calculate other planet's aspect point
-                    if other_aspect_distance == 7:
-                        other_aspect_point = norm_deg(other_lon + 180)
-                    elif other_aspect_distance == 4:
-                        other_aspect_point = norm_deg(other_lon + 90)
-                    elif other_aspect_distance == 8:
-                        other_aspect_point = norm_deg(other_lon + 210)
-                    elif other_aspect_distance == 3:
-                        other_aspect_point = norm_deg(other_lon + 60)
-                    elif other_aspect_distance == 10:
-                        other_aspect_point = norm_deg(other_lon + 270)
-                    elif other_aspect_distance == 5:
-                        other_aspect_point = norm_deg(other_lon + 120)
-                    elif other_aspect_distance == 9:
-                        other_aspect_point = norm_deg(other_lon + 240)
-                    else:
+                    if other_aspect_distance not in ASPECT_OFFSETS:
                         continue
+                    other_aspect_point = norm_deg(other_lon + ASPECT_OFFSETS[other_aspect_distance])
                     
                     # Check if this planet falls within other planet's aspect orb
                     diff = abs(planet_lon - other_aspect_point)
@@ -362,19 +355,6 @@ if st.sidebar.button("🔮 Generate Chart", type="primary"):
     # Calculate controlling aspects for all planets
     p_controlling = {p: get_controlling_aspects(p, lon) for p, lon in planet_lon_sid.items()}
 
-    # Sign and nakshatra lords
-    SIGN_LORD = {
-        "Sun": [4], "Moon": [3], "Mars": [0,7], "Mercury": [2,5],
-        "Jupiter": [8,11], "Venus": [1,6], "Saturn": [9,10],
-        "Rahu": [5], "Ketu": [11],
-    }
-
-    NAKSHATRA_LORD = {
-        "Ketu": [0, 9, 18], "Venus": [1, 10, 19], "Sun": [2, 11, 20],
-        "Moon": [3, 12, 21], "Mars": [4, 13, 22], "Rahu": [5, 14, 23],
-        "Jupiter": [6, 15, 24], "Saturn": [7, 16, 25], "Mercury": [8, 17, 26],
-    }
-
     planet_names = [p for p, _ in PLANETS]
 
     # Just store data, display is handled outside this block
@@ -433,7 +413,13 @@ if st.sidebar.button("🔮 Generate Chart", type="primary"):
         'birth_local': birth_local,
         'ayanamsa_deg': ayanamsa_deg,
         'cusps_sid': cusps_sid,
-        'ascendant_sign_idx': ascendant_sign_idx
+        'ascendant_sign_idx': ascendant_sign_idx,
+        # Tropical inputs for deriving ayanamsa/house system variants
+        'jd_ut': jd_ut,
+        'latitude': latitude,
+        'longitude': longitude,
+        'planet_lon_trop': planet_lon_trop,
+        'planet_speed': planet_speed
     }
     st.session_state.chart_generated = True
 
@@ -446,15 +432,10 @@ if st.session_state.chart_generated and 'chart_data' in st.session_state:
     
     # Define helper functions first
     def sign_name(idx):
-        return ["Aries","Taurus","Gemini","Cancer","Leo","Virgo","Libra","Scorpio",
-                "Sagittarius","Capricorn","Aquarius","Pisces"][idx % 12]
+        return SIGN_NAMES[idx % 12]
     
     def nakshatra_name(idx):
-        names = ["Ashvini","Bharani","Krittika","Rohini","Mrigashira","Ardra","Punarvasu","Pushya","Ashlesha",
-                "Magha","Purva Phalguni","Uttara Phalguni","Hasta","Chitra","Swati","Vishakha","Anuradha","Jyeshtha",
-                "Mula","Purva Ashadha","Uttara Ashadha","Shravana","Dhanishta","Shatabhisha","Purva Bhadrapada",
-                "Uttara Bhadrapada","Revati"]
-        return names[idx % 27]
+        return NAKSHATRA_NAMES[idx % 27]
     
     # Chart info (from stored data)
     birth_local = chart_data['birth_local']
@@ -525,6 +506,139 @@ if st.session_state.chart_generated and 'chart_data' in st.session_state:
     df_analysis = pd.DataFrame(analysis_data)
     st.dataframe(df_analysis, use_container_width=True)
 
+    # Chart diagrams (memoized by chart fingerprint, so reruns reuse the rendered output)
+    st.subheader("🗺️ Chart Diagram")
+    diagram_style = st.radio(
+        "Chart Style",
+        list(STYLES),
+        format_func=STYLES.get,
+        horizontal=True,
+        key="diagram_style",
+        help="Aspect lines are drawn for full-strength (100%) aspects"
+    )
+    st.image(chart_svg(chart_data, diagram_style))
+
+    fingerprint = chart_fingerprint(chart_data)
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.download_button("⬇️ SVG", chart_svg(chart_data, diagram_style),
+                           file_name=f"chart_{diagram_style}_{fingerprint}.svg", mime="image/svg+xml")
+    with col2:
+        st.download_button("⬇️ PNG", chart_image(chart_data, diagram_style, "png"),
+                           file_name=f"chart_{diagram_style}_{fingerprint}.png", mime="image/png")
+    with col3:
+        st.download_button("⬇️ PDF", chart_image(chart_data, diagram_style, "pdf"),
+                           file_name=f"chart_{diagram_style}_{fingerprint}.pdf", mime="application/pdf")
+
+    # Ayanamsa and house system comparison
+    st.subheader("⚖️ Ayanamsa & House System Comparison")
+    compare_mode = st.checkbox(
+        "Compare ayanamsas and house systems",
+        value=False,
+        key="compare_mode",
+        help="Derive every selected variant from the same ephemeris pass and show where it differs from the generated chart. "
+             "Sripati places planets between cusp midpoints; Placidus and Equal place them from each house's cusp."
+    )
+
+    if compare_mode:
+        col1, col2 = st.columns(2)
+        with col1:
+            compare_ayanamsas = st.multiselect(
+                "Ayanamsas",
+                list(AYANAMSA_MODELS),
+                default=list(AYANAMSA_MODELS),
+                key="compare_ayanamsas"
+            )
+        with col2:
+            compare_systems = st.multiselect(
+                "House Systems",
+                HOUSE_SYSTEMS,
+                default=HOUSE_SYSTEMS,
+                key="compare_systems"
+            )
+
+        if compare_ayanamsas and compare_systems:
+            variants = chart_variants(chart_data, compare_ayanamsas, compare_systems)
+            unavailable = [s for s in compare_systems if s not in {system for _, system in variants}]
+            if unavailable:
+                st.warning(f"⚠️ {', '.join(unavailable)} has no solution at latitude "
+                           f"{chart_data['latitude']:.3f}° and is left out of the comparison.")
+
+            summary_data = []
+            difference_data = []
+            for (ayanamsa, system), variant in variants.items():
+                differences = chart_differences(chart_data, variant)
+                summary_data.append({
+                    "Ayanamsa": ayanamsa,
+                    "House System": system,
+                    "Ayanamsa (°)": round(variant['ayanamsa_deg'], 4),
+                    "Ascendant": f"{sign_name(variant['house_sign_idx'][1])} ({variant['cusps_sid'][1]:.1f}°)",
+                    "Differences": len(differences),
+                    "Planets Affected": ", ".join(sorted(
+                        {row["Planet"] for row in differences}, key=planet_names.index
+                    )) or "None"
+                })
+                for row in differences:
+                    difference_data.append({"Ayanamsa": ayanamsa, "House System": system, **row})
+
+            if summary_data:
+                st.dataframe(pd.DataFrame(summary_data), use_container_width=True)
+                if difference_data:
+                    st.dataframe(pd.DataFrame(difference_data), use_container_width=True)
+                else:
+                    st.info("All selected variants match the generated chart.")
+        else:
+            st.info("Select at least one ayanamsa and one house system to compare.")
+
+    # Rarity against the precomputed base-rate cubes
+    st.subheader("📊 How Rare Is This Chart?")
+
+    @st.cache_resource
+    def get_base_rates():
+        # Loaded once per process and shared across sessions
+        return load_base_rates()
+
+    # Check for the file first so a missing build is never cached
+    base_rates = get_base_rates() if os.path.exists(BASE_RATES_PATH) else None
+    if base_rates is None:
+        st.info("Base-rate statistics are not available. Build them once with `python base_rates.py`.")
+    else:
+        rarity = chart_rarity(base_rates, chart_arrays(chart_data))
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("Rarer than", f"{rarity['percentile']:.1f}% of charts")
+        with col2:
+            st.metric("Sample size", f"{base_rates['n_charts']:,} charts (1800–2100)")
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.write("**Rarest Placements & Relations**")
+            st.dataframe(pd.DataFrame(
+                [{"Feature": f, "Frequency": f"{freq:.2%}"} for f, freq in rarity['features']]
+            ), use_container_width=True, hide_index=True)
+        with col2:
+            st.write("**Rarest Aspect & Control Patterns**")
+            st.dataframe(pd.DataFrame(
+                [{"Pattern": p, "Frequency": f"{freq:.2%}"} for p, freq in rarity['patterns']]
+            ), use_container_width=True, hide_index=True)
+
+        st.write("**Least Expected Combinations**")
+        st.dataframe(pd.DataFrame([
+            {"Feature A": a, "Feature B": b, "Frequency": f"{joint:.3%}",
+             "If Independent": f"{expected:.3%}", "Ratio": round(ratio, 2)}
+            for a, b, joint, expected, ratio in rarity['pairs']
+        ]), use_container_width=True, hide_index=True)
+
+        with st.expander("🔎 Look up any combination"):
+            col1, col2 = st.columns(2)
+            with col1:
+                feature_a = st.selectbox("Feature A", base_rates['feature_names'], key="rarity_feature_a")
+            with col2:
+                feature_b = st.selectbox("Feature B", base_rates['feature_names'], index=1, key="rarity_feature_b")
+            joint = combination_frequency(base_rates, feature_a, feature_b)
+            st.write(f"**{feature_a}** together with **{feature_b}** occurs in {joint:.3%} of charts.")
+
 else:
     st.info("👈 Enter your birth details in the sidebar and click 'Generate Chart' to begin!")
     
@@ -708,35 +822,38 @@ if st.session_state.chart_generated and 'chart_data' in st.session_state:
         if common_houses:
             st.write(f"**🎯 Common Active Houses: {', '.join([f'H{h}' for h in sorted(common_houses)])}**")
             
-            # Show detailed breakdown for common houses
+            # Build the breakdown for common houses: reasons grouped by house and dasha level
+            dasha_levels = [
+                ("MD", mahadasha, maha_houses),
+                ("AD", antardasha, antar_houses),
+                ("PD", pratyantardasha, pratyantar_houses),
+            ]
+            breakdown = {house: {level: [] for level, _, _ in dasha_levels} for house in common_houses}
+            breakdown_rows = []
+            for level, planet, activations in dasha_levels:
+                for house, reason, priority in activations:
+                    if house in breakdown:
+                        breakdown[house][level].append(reason)
+                        breakdown_rows.append({
+                            "House": house, "Level": level, "Planet": planet,
+                            "Priority": priority, "Reason": reason
+                        })
+            breakdown_rows.sort(key=lambda row: row["House"])
+
+            # Render as one table (top 3 reasons per level) plus a single on-demand expander,
+            # so the number of elements stays fixed however many houses are common
             st.subheader("📋 Detailed House Activation")
-            
+
+            header = "| House | " + " | ".join(f"{planet} ({level})" for level, planet, _ in dasha_levels) + " |"
+            table_lines = [header, "|---" * (len(dasha_levels) + 1) + "|"]
             for house in sorted(common_houses):
-                st.write(f"**House {house}:**")
-                
-                # Show why each planet activates this house (extract reason from tuple)
-                maha_reasons = [reason[1] for reason in maha_houses if reason[0] == house]
-                antar_reasons = [reason[1] for reason in antar_houses if reason[0] == house]
-                pratyantar_reasons = [reason[1] for reason in pratyantar_houses if reason[0] == house]
-                
-                col1, col2, col3 = st.columns(3)
-                
-                with col1:
-                    st.write(f"**{mahadasha} (MD):**")
-                    for reason in maha_reasons[:3]:  # Limit to top 3 reasons
-                        st.write(f"• {reason}")
-                
-                with col2:
-                    st.write(f"**{antardasha} (AD):**")
-                    for reason in antar_reasons[:3]:  # Limit to top 3 reasons
-                        st.write(f"• {reason}")
-                
-                with col3:
-                    st.write(f"**{pratyantardasha} (PD):**") 
-                    for reason in pratyantar_reasons[:3]:  # Limit to top 3 reasons
-                        st.write(f"• {reason}")
-                
-                st.write("---")
+                cells = ["<br>".join(f"• {reason}" for reason in breakdown[house][level][:3])
+                         for level, _, _ in dasha_levels]
+                table_lines.append(f"| **H{house}** | " + " | ".join(cells) + " |")
+            st.markdown("\n".join(table_lines), unsafe_allow_html=True)
+
+            with st.expander(f"All activation reasons ({len(breakdown_rows)})"):
+                st.dataframe(pd.DataFrame(breakdown_rows), use_container_width=True, hide_index=True)
         else:
             st.warning("⚠️ No common houses found for this dasha combination.")
             
@@ -757,3 +874,43 @@ if st.session_state.chart_generated and 'chart_data' in st.session_state:
         # Footer
         st.markdown("---")
         st.markdown("*Generated using Swiss Ephemeris and traditional Vedic astrology calculations*")
+
+# Birth data sensitivity analysis (Available after chart generation)
+if st.session_state.chart_generated and 'chart_data' in st.session_state:
+    st.subheader("🎲 Birth Data Sensitivity")
+
+    chart_data = st.session_state.chart_data
+
+    run_sensitivity = st.checkbox(
+        "Run sensitivity analysis",
+        value=False,
+        key="run_sensitivity",
+        help="Sample birth times and locations within the sidebar error bars and show how stable the chart is"
+    )
+
+    if run_sensitivity:
+        samples = sample_birth_data(chart_data, n_samples, time_error_min, lat_error_deg, lon_error_deg)
+        house_cols = [f"H{h}" for h in range(1, 13)]
+
+        st.caption(f"{n_samples:,} samples within ±{time_error_min} min, "
+                   f"±{lat_error_deg:.3f}° latitude, ±{lon_error_deg:.3f}° longitude")
+
+        # Probability of each house placement
+        st.write("**House Placement Probability (%)**")
+        placement = (samples['p_house'][..., None] == np.arange(1, 13)).mean(axis=0) * 100
+        st.dataframe(pd.DataFrame(placement.round(1), index=PLANET_NAMES, columns=house_cols),
+                     use_container_width=True)
+
+        # Probability of each controlling relation
+        st.write("**Controlling Probability (%)** (row planet controls column planet)")
+        controlling = samples['p_controlling'].mean(axis=0) * 100
+        st.dataframe(pd.DataFrame(controlling.round(1), index=PLANET_NAMES, columns=PLANET_NAMES),
+                     use_container_width=True)
+
+        # Probability of each house being a common dasha activation
+        active = activation_mask(samples, aspects_only=filter_aspects)
+        maha_i, antar_i, pratyantar_i = (PLANET_NAMES.index(p) for p in (mahadasha, antardasha, pratyantardasha))
+        common = active[:, maha_i] & active[:, antar_i] & active[:, pratyantar_i]
+        st.write(f"**Common Active House Probability (%)** for {mahadasha} MD → {antardasha} AD → {pratyantardasha} PD")
+        st.dataframe(pd.DataFrame([(common.mean(axis=0) * 100).round(1)], columns=house_cols),
+                     use_container_width=True, hide_index=True)